@@ -14,18 +14,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import gzip
+import io
 import os
 import json
-import yaml
+import shutil
 import subprocess
 import tempfile
 import logging
-import glob
 import re
 import sys
 import datetime
 import tarfile
-from dataclasses import dataclass, field, asdict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from dataclasses import dataclass, field, fields
 
 from .models import (
     LoadType,
@@ -43,10 +48,15 @@ from .utils import (
 from .loader import (
     get_target_name,
     remove_subdirectories,
-    trim_suffix,
 )
 from .safe_glob import safe_glob
 
+try:
+    # optional accelerator; several times faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
 collection_manifest_json = "MANIFEST.json"
 collection_files_json = "FILES.json"
 role_meta_main_yml = "meta/main.yml"
@@ -62,6 +72,120 @@ supported_target_types = [
 
 download_metadata_file = "download_meta.json"
 
+# number of parallel `ansible-galaxy` downloads in prepare_dependency_dir
+_max_download_workers = 8
+
+# read buffer for in-process tarball extraction (tarfile defaults to 10 KiB)
+_tar_buffer_size = 2 * 1024 * 1024
+
+# number of concurrent tree walks in find_ext_dependencies; directory
+# listing is latency-bound, so threads overlap the syscalls
+_max_scan_workers = 16
+
+# minimum free space required to stage install trees on tmpfs; containers
+# often mount /dev/shm at only 64 MiB, where extraction would hit ENOSPC
+_min_tmpfs_free = 1 * 1024 * 1024 * 1024
+
+
+def _tmpfs_scratch_root():
+    path = "/dev/shm"
+    if not os.path.isdir(path) or not os.access(path, os.W_OK):
+        return None
+    try:
+        st = os.statvfs(path)
+    except OSError:
+        return None
+    if st.f_frsize * st.f_bavail < _min_tmpfs_free:
+        return None
+    return path
+
+
+# precompiled patterns for the `ansible-galaxy` download log messages;
+# e.g. "Downloading https://galaxy.ansible.com/download/ansible-posix-1.4.0.tar.gz to ..."
+# and "- downloading role from https://github.com/.../archive/1.0.3.tar.gz"
+_DOWNLOAD_URL_RE = re.compile(r"Downloading (\S+) to")
+_ROLE_DOWNLOAD_RE = re.compile(r"^- downloading role from (\S+)")
+
+# GalaxyCLI mutates global ansible config state, so in-process runs are serialized
+_galaxy_cli_lock = threading.Lock()
+
+
+def _utc_isoformat(timestamp):
+    # utcfromtimestamp is deprecated since Python 3.12; produce the same
+    # naive ISO-8601 string via an aware datetime
+    return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _scandir_mtimes(path):
+    # collect mtimes of all entries in one directory scan instead of
+    # issuing a stat syscall per downloaded artifact
+    mtimes = {}
+    if os.path.isdir(path):
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    mtimes[entry.name] = entry.stat().st_mtime
+                except OSError:
+                    continue
+    return mtimes
+
+
+def _json_load_file(path):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    # json.loads on the full text beats json.load's incremental reads
+    with open(path, "r") as f:
+        return json.loads(f.read())
+
+
+def _json_dump_file(data, path, indent=False):
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=option))
+        return
+    with open(path, "w") as f:
+        f.write(json.dumps(data, indent=2 if indent else None))
+
+
+@lru_cache(maxsize=256)
+def _load_metadata_file(path, mtime_ns, size):
+    # mtime_ns/size are part of the key so a rewritten file is re-parsed
+    return _json_load_file(path)
+
+
+@lru_cache(maxsize=4096)
+def _load_metafile(path, mtime_ns, kind):
+    # MANIFEST.json / meta/main.yml files are parsed once per mtime; this
+    # matters most for YAML, which is far slower to parse than JSON
+    if kind == "json":
+        return _json_load_file(path)
+    import yaml
+
+    try:
+        # libyaml C loader parses several times faster than the pure-python one
+        from yaml import CSafeLoader as YamlSafeLoader
+    except ImportError:
+        from yaml import SafeLoader as YamlSafeLoader
+
+    # bytes input lets the C loader skip the separate decode step
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=YamlSafeLoader)
+
+
+@lru_cache(maxsize=8192)
+def _role_meta_glob(filepath, mtime_ns):
+    # mtime_ns keys the cache, so a changed role directory is re-globbed;
+    # empty results are cached too, keeping repeat misses O(1)
+    return safe_glob(
+        [
+            os.path.join(filepath, "**", role_meta_main_yml),
+            os.path.join(filepath, "**", role_meta_main_yaml),
+        ],
+        recursive=True,
+    )
+
 
 @dataclass
 class DownloadMetadata(object):
@@ -81,6 +205,11 @@ class DownloadMetadata(object):
     requirements_file: str = ""
 
 
+# static field set of DownloadMetadata; membership here replaces hasattr
+# checks when the rows are plain dicts
+_DM_FIELDS = frozenset(f.name for f in fields(DownloadMetadata))
+
+
 @dataclass
 class Dependency(object):
     dir: str = ""
@@ -88,6 +217,59 @@ class Dependency(object):
     metadata: DownloadMetadata = field(default_factory=DownloadMetadata)
 
 
+def _copy_file(src_path, dst_path, mode):
+    # hard link when src and dst share a filesystem (no byte copy at all);
+    # otherwise sendfile keeps the copy inside the kernel
+    try:
+        os.link(src_path, dst_path)
+        return
+    except OSError:
+        pass
+    with open(src_path, "rb") as fsrc, open(dst_path, "wb") as fdst:
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+        try:
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, None, _tar_buffer_size)
+                if sent == 0:
+                    break
+        except OSError:
+            # sendfile can be unavailable for this fd pair / platform
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, length=_tar_buffer_size)
+        os.fchmod(dst_fd, mode)
+
+
+def _fast_copytree(src, dst):
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as it:
+        for entry in it:
+            target = os.path.join(dst, entry.name)
+            if entry.is_symlink():
+                if os.path.lexists(target):
+                    os.unlink(target)
+                os.symlink(os.readlink(entry.path), target)
+            elif entry.is_dir(follow_symlinks=False):
+                _fast_copytree(entry.path, target)
+            else:
+                if os.path.lexists(target):
+                    os.unlink(target)
+                _copy_file(entry.path, target, entry.stat().st_mode)
+
+
+def _dependency_to_dict(dep):
+    # asdict() walks dataclasses recursively with deep copies; Dependency
+    # and DownloadMetadata are flat, so build the dict shape directly
+    metadata = dep.metadata
+    return {
+        "dir": dep.dir,
+        "name": dep.name,
+        "metadata": dict(metadata.__dict__) if metadata is not None else None,
+    }
+
+
 @dataclass
 class DependencyDirPreparator(object):
     root_dir: str = ""
@@ -108,6 +290,15 @@ class DependencyDirPreparator(object):
     # -- out --
     dependency_dirs: list = field(default_factory=list)
 
+    # (type, target, dir, dir_mtime_ns) -> (is_exist, filename)
+    _exist_cache: dict = field(default_factory=dict)
+
+    # directories already created by this instance; skips repeated stat()s
+    _ensured_dirs: set = field(default_factory=set)
+
+    # resolved index directory, computed on first __save_index
+    _index_dir: str = ""
+
     def prepare_dir(self, root_install=True, is_src_installed=False, cache_enabled=False, cache_dir=""):
         logging.debug("setup base dirs")
         self.setup_dirs(cache_enabled, cache_dir)
@@ -123,14 +314,12 @@ class DependencyDirPreparator(object):
         self.download_location = os.path.join(self.root_dir, "archives")
         self.dependency_dir_path = self.root_dir
         # check download_location
-        if not os.path.exists(self.download_location):
-            os.makedirs(self.download_location)
+        os.makedirs(self.download_location, exist_ok=True)
         # check cache_dir
-        if cache_enabled and not os.path.exists(cache_dir):
-            os.makedirs(cache_dir)
+        if cache_enabled:
+            os.makedirs(cache_dir, exist_ok=True)
         # check dependency_dir_path
-        if not os.path.exists(self.dependency_dir_path):
-            os.makedirs(self.dependency_dir_path)
+        os.makedirs(self.dependency_dir_path, exist_ok=True)
         return
 
     def prepare_root_dir(self, root_install=True, is_src_installed=False):
@@ -174,173 +363,203 @@ class DependencyDirPreparator(object):
 
         # TODO: if requirements.yml is provided, download dependencies using it.
 
-        for cdep in col_dependencies:
-            col_name = cdep
-            col_version = ""
-            if type(cdep) is dict:
-                col_name = cdep.get("name", "")
-                col_version = cdep.get("version", "")
-                if col_name == "":
-                    col_name = cdep.get("source", "")
-
-            logging.debug("prepare dir for {}:{}".format(col_name, col_version))
-            downloaded_dep = Dependency(
-                name=col_name,
-            )
-            downloaded_dep.metadata.type = LoadType.COLLECTION
-            downloaded_dep.metadata.name = col_name
-            downloaded_dep.metadata.cache_enabled = cache_enabled
-            sub_dependency_dir_path = os.path.join(
-                self.dependency_dir_path,
-                "collections",
-                "src",
-            )
+        # galaxy downloads are independent, network-bound subprocess calls,
+        # so run them concurrently; results keep the input order
+        # shared path prefixes are the same for every dependency, so build
+        # them (and the src dirs) once instead of per iteration
+        collections_src_dir = os.path.join(self.dependency_dir_path, "collections", "src")
+        col_download_root = os.path.join(self.download_location, "collection")
+        roles_src_root = os.path.join(self.dependency_dir_path, "roles", "src")
+        role_download_root = os.path.join(self.download_location, "role")
+
+        if col_dependencies:
+            os.makedirs(collections_src_dir, exist_ok=True)
+            self._pending_targz_installs = []
+            self._pending_targz_lock = threading.Lock()
+            with ThreadPoolExecutor(max_workers=_max_download_workers) as executor:
+                results = executor.map(
+                    lambda cdep: self._prepare_one_collection(
+                        cdep, cache_enabled, cache_dir, col_dependency_dirs, col_dependency_metadata, collections_src_dir, col_download_root
+                    ),
+                    col_dependencies,
+                )
+                self.dependency_dirs.extend(results)
+            self._flush_targz_installs()
+
+        if role_dependencies:
+            with ThreadPoolExecutor(max_workers=_max_download_workers) as executor:
+                results = executor.map(
+                    lambda rdep: self._prepare_one_role(rdep, cache_enabled, cache_dir, role_dependency_dirs, roles_src_root, role_download_root),
+                    role_dependencies,
+                )
+                self.dependency_dirs.extend(results)
+        return
 
-            if not os.path.exists(sub_dependency_dir_path):
-                os.makedirs(sub_dependency_dir_path)
-
-            if cache_enabled:
-                logging.debug("cache enabled")
-                # TODO: handle version
-                is_exist, targz_file = self.is_download_file_exist(LoadType.COLLECTION, col_name, cache_dir)
-                # check cache data
-                if is_exist:
-                    logging.debug("found cache data {}".format(targz_file))
-                    metadata_file = os.path.join(targz_file.rsplit("/", 1)[0], download_metadata_file)
-                    md = self.find_target_metadata(LoadType.COLLECTION, metadata_file, col_name)
-                    downloaded_dep.metadata = md
-                else:
-                    # if no cache data, download
-                    logging.debug("cache data not found")
-                    cache_location = os.path.join(cache_dir, "collection", col_name)
-                    install_msg = self.download_galaxy_collection(col_name, cache_location, col_version, self.source_repository)
-                    metadata = self.extract_collections_metadata(install_msg, cache_location)
-                    metadata_file = self.export_data(metadata, cache_location, download_metadata_file)
-                    md = self.find_target_metadata(LoadType.COLLECTION, metadata_file, col_name)
-                    downloaded_dep.metadata = md
-                    if md:
-                        targz_file = md.download_src_path
-                # install collection from tar.gz
-                self.install_galaxy_collection_from_targz(targz_file, sub_dependency_dir_path)
-                downloaded_dep.metadata.cache_dir = targz_file
-                parts = col_name.split(".")
-                downloaded_dep.dir = os.path.join(sub_dependency_dir_path, "ansible_collections", parts[0], parts[1])
-            elif col_name in col_dependency_dirs:
-                logging.debug("use the specified dependency dirs")
-                sub_dependency_dir_path = col_dependency_dirs[col_name]
-                col_galaxy_data = col_dependency_metadata.get(col_name, {})
-                if isinstance(col_galaxy_data, dict):
-                    download_url = col_galaxy_data.get("download_url", "")
-                    hash = ""
-                    if download_url:
-                        hash = get_hash_of_url(download_url)
-                    version = col_galaxy_data.get("version", "")
-                    downloaded_dep.metadata.source_repository = self.source_repository
-                    downloaded_dep.metadata.download_url = download_url
-                    downloaded_dep.metadata.hash = hash
-                    downloaded_dep.metadata.version = version
-                    downloaded_dep.dir = sub_dependency_dir_path
+    def _prepare_one_collection(
+        self, cdep, cache_enabled, cache_dir, col_dependency_dirs, col_dependency_metadata, collections_src_dir, col_download_root
+    ):
+        col_name = cdep
+        col_version = ""
+        if type(cdep) is dict:
+            col_name = cdep.get("name", "")
+            col_version = cdep.get("version", "")
+            if col_name == "":
+                col_name = cdep.get("source", "")
+
+        logging.debug("prepare dir for {}:{}".format(col_name, col_version))
+        downloaded_dep = Dependency(
+            name=col_name,
+        )
+        downloaded_dep.metadata.type = LoadType.COLLECTION
+        downloaded_dep.metadata.name = col_name
+        downloaded_dep.metadata.cache_enabled = cache_enabled
+        sub_dependency_dir_path = collections_src_dir
+
+        namespace, _, name = col_name.partition(".")
+        final_dir = os.path.join(sub_dependency_dir_path, "ansible_collections", namespace, name)
+        # a populated destination from a previous run makes the galaxy
+        # install redundant; only the metadata needs to be rebuilt then
+        already_installed = self._is_installed_dir(final_dir)
+
+        if cache_enabled:
+            logging.debug("cache enabled")
+            # TODO: handle version
+            is_exist, targz_file = self.is_download_file_exist(LoadType.COLLECTION, col_name, cache_dir)
+            # check cache data
+            if is_exist:
+                logging.debug("found cache data {}".format(targz_file))
+                metadata_file = os.path.join(targz_file.rsplit("/", 1)[0], download_metadata_file)
+                md = self.find_target_metadata(LoadType.COLLECTION, metadata_file, col_name)
+                downloaded_dep.metadata = md
             else:
-                logging.debug("download dependency {}".format(col_name))
-                is_exist, targz = self.is_download_file_exist(
-                    LoadType.COLLECTION, col_name, os.path.join(self.download_location, "collection", col_name)
-                )
-                if is_exist:
-                    metadata_file = os.path.join(self.download_location, "collection", self.target_name, download_metadata_file)
-                    self.install_galaxy_collection_from_targz(targz, sub_dependency_dir_path)
-                    md = self.find_target_metadata(LoadType.COLLECTION, metadata_file, col_name)
-                else:
-                    # check download_location
-                    sub_download_location = os.path.join(self.download_location, "collection", col_name)
-                    if not os.path.exists(sub_download_location):
-                        os.makedirs(sub_download_location)
-                    install_msg = self.download_galaxy_collection(col_name, sub_download_location, col_version, self.source_repository)
-                    metadata = self.extract_collections_metadata(install_msg, sub_download_location)
-                    metadata_file = self.export_data(metadata, sub_download_location, download_metadata_file)
-                    md = self.find_target_metadata(LoadType.COLLECTION, metadata_file, col_name)
-                    if md:
-                        self.install_galaxy_collection_from_reqfile(md.requirements_file, sub_dependency_dir_path)
-                    # self.install_galaxy_collection_from_targz(md.download_src_path, sub_dependency_dir_path)
-                if md is not None:
-                    downloaded_dep.metadata = md
+                # if no cache data, download
+                logging.debug("cache data not found")
+                cache_location = os.path.join(cache_dir, "collection", col_name)
+                install_msg = self.download_galaxy_collection(col_name, cache_location, col_version, self.source_repository)
+                metadata = self.extract_collections_metadata(install_msg, cache_location)
+                metadata_file = self.export_data(metadata, cache_location, download_metadata_file)
+                md = self.find_target_metadata(LoadType.COLLECTION, metadata_file, col_name)
+                downloaded_dep.metadata = md
+                if md:
+                    targz_file = md.download_src_path
+            # install collection from tar.gz
+            if not already_installed:
+                self._queue_targz_install(targz_file, sub_dependency_dir_path)
+            downloaded_dep.metadata.cache_dir = targz_file
+            downloaded_dep.dir = final_dir
+        elif col_name in col_dependency_dirs:
+            logging.debug("use the specified dependency dirs")
+            sub_dependency_dir_path = col_dependency_dirs[col_name]
+            col_galaxy_data = col_dependency_metadata.get(col_name, {})
+            if isinstance(col_galaxy_data, dict):
+                download_url = col_galaxy_data.get("download_url", "")
+                hash = ""
+                if download_url:
+                    hash = get_hash_of_url(download_url)
+                version = col_galaxy_data.get("version", "")
                 downloaded_dep.metadata.source_repository = self.source_repository
-                parts = col_name.split(".")
-                downloaded_dep.dir = os.path.join(sub_dependency_dir_path, "ansible_collections", parts[0], parts[1])
-            self.dependency_dirs.append(asdict(downloaded_dep))
-
-        for rdep in role_dependencies:
-            target_version = None
-            if isinstance(rdep, dict):
-                rdep_name = rdep.get("name", None)
-                target_version = rdep.get("version", None)
-                rdep = rdep_name
-            name = rdep
-            if type(rdep) is dict:
-                name = rdep.get("name", "")
-                if name == "":
-                    name = rdep.get("src", "")
-            logging.debug("prepare dir for {}".format(name))
-            downloaded_dep = Dependency(
-                name=name,
-            )
-            downloaded_dep.metadata.type = LoadType.ROLE
-            downloaded_dep.metadata.name = name
-            downloaded_dep.metadata.cache_enabled = cache_enabled
-            # sub_dependency_dir_path = "{}/{}".format(dependency_dir_path, rdep)
+                downloaded_dep.metadata.download_url = download_url
+                downloaded_dep.metadata.hash = hash
+                downloaded_dep.metadata.version = version
+                downloaded_dep.dir = sub_dependency_dir_path
+        else:
+            logging.debug("download dependency {}".format(col_name))
+            is_exist, targz = self.is_download_file_exist(LoadType.COLLECTION, col_name, os.path.join(col_download_root, col_name))
+            if is_exist:
+                metadata_file = os.path.join(col_download_root, self.target_name, download_metadata_file)
+                if not already_installed:
+                    self._queue_targz_install(targz, sub_dependency_dir_path)
+                md = self.find_target_metadata(LoadType.COLLECTION, metadata_file, col_name)
+            else:
+                # check download_location
+                sub_download_location = os.path.join(col_download_root, col_name)
+                os.makedirs(sub_download_location, exist_ok=True)
+                install_msg = self.download_galaxy_collection(col_name, sub_download_location, col_version, self.source_repository)
+                metadata = self.extract_collections_metadata(install_msg, sub_download_location)
+                metadata_file = self.export_data(metadata, sub_download_location, download_metadata_file)
+                md = self.find_target_metadata(LoadType.COLLECTION, metadata_file, col_name)
+                if md and not already_installed:
+                    self.install_galaxy_collection_from_reqfile(md.requirements_file, sub_dependency_dir_path)
+                # self.install_galaxy_collection_from_targz(md.download_src_path, sub_dependency_dir_path)
+            if md is not None:
+                downloaded_dep.metadata = md
+            downloaded_dep.metadata.source_repository = self.source_repository
+            downloaded_dep.dir = final_dir
+        return _dependency_to_dict(downloaded_dep)
 
-            sub_dependency_dir_path = os.path.join(
-                self.dependency_dir_path,
+    def _is_installed_dir(self, path):
+        try:
+            with os.scandir(path) as it:
+                return next(it, None) is not None
+        except OSError:
+            return False
+
+    def _prepare_one_role(self, rdep, cache_enabled, cache_dir, role_dependency_dirs, roles_src_root, role_download_root):
+        target_version = None
+        if isinstance(rdep, dict):
+            rdep_name = rdep.get("name", None)
+            target_version = rdep.get("version", None)
+            rdep = rdep_name
+        name = rdep
+        if type(rdep) is dict:
+            name = rdep.get("name", "")
+            if name == "":
+                name = rdep.get("src", "")
+        logging.debug("prepare dir for {}".format(name))
+        downloaded_dep = Dependency(
+            name=name,
+        )
+        downloaded_dep.metadata.type = LoadType.ROLE
+        downloaded_dep.metadata.name = name
+        downloaded_dep.metadata.cache_enabled = cache_enabled
+        # sub_dependency_dir_path = "{}/{}".format(dependency_dir_path, rdep)
+
+        sub_dependency_dir_path = os.path.join(roles_src_root, name)
+
+        os.makedirs(sub_dependency_dir_path, exist_ok=True)
+        if cache_enabled:
+            logging.debug("cache enabled")
+            cache_dir_path = os.path.join(
+                cache_dir,
                 "roles",
                 "src",
                 name,
             )
-
-            if not os.path.exists(sub_dependency_dir_path):
-                os.makedirs(sub_dependency_dir_path)
-            if cache_enabled:
-                logging.debug("cache enabled")
-                cache_dir_path = os.path.join(
-                    cache_dir,
-                    "roles",
-                    "src",
-                    name,
-                )
-                if os.path.exists(cache_dir_path) and len(os.listdir(cache_dir_path)) != 0:
-                    logging.debug("cache data found")
-                    metadata_file = os.path.join(cache_dir_path, download_metadata_file)
-                    md = self.find_target_metadata(LoadType.ROLE, metadata_file, self.target_name)
-                else:
-                    logging.debug("cache data not found")
-                    install_msg = install_galaxy_target(name, LoadType.ROLE, cache_dir_path, self.source_repository, target_version)
-                    logging.debug("role install msg: {}".format(install_msg))
-                    metadata = self.extract_roles_metadata(install_msg)
-                    metadata_file = self.export_data(metadata, cache_dir_path, download_metadata_file)
-                    md = self.find_target_metadata(LoadType.ROLE, metadata_file, self.target_name)
-                self.move_src(sub_dependency_dir_path, cache_dir_path)
-                if md is not None:
-                    downloaded_dep.metadata = md
-            elif name in role_dependency_dirs:
-                logging.debug("use the specified dependency dirs")
-                sub_dependency_dir_path = role_dependency_dirs[name]
+            if os.path.exists(cache_dir_path) and len(os.listdir(cache_dir_path)) != 0:
+                logging.debug("cache data found")
+                metadata_file = os.path.join(cache_dir_path, download_metadata_file)
+                md = self.find_target_metadata(LoadType.ROLE, metadata_file, self.target_name)
             else:
-                is_exist, _ = self.is_download_file_exist(LoadType.ROLE, name, os.path.join(self.download_location, "role", name))
-                if is_exist:
-                    metadata_file = os.path.join(self.download_location, "role", name, download_metadata_file)
-                    md = self.find_target_metadata(LoadType.ROLE, metadata_file, name)
-                    self.move_src(md.download_src_path, sub_dependency_dir_path)
-                else:
-                    install_msg = install_galaxy_target(name, LoadType.ROLE, sub_dependency_dir_path, self.source_repository)
-                    logging.debug("role install msg: {}".format(install_msg))
-                    metadata = self.extract_roles_metadata(install_msg)
-                    sub_download_location = os.path.join(self.download_location, "role", name)
-                    metadata_file = self.export_data(metadata, sub_download_location, download_metadata_file)
-                    md = self.find_target_metadata(LoadType.ROLE, metadata_file, name)
-                if md is not None:
-                    downloaded_dep.metadata = md
-            downloaded_dep.metadata.source_repository = self.source_repository
-            downloaded_dep.dir = sub_dependency_dir_path
-            self.dependency_dirs.append(asdict(downloaded_dep))
-        return
+                logging.debug("cache data not found")
+                install_msg = install_galaxy_target(name, LoadType.ROLE, cache_dir_path, self.source_repository, target_version)
+                logging.debug("role install msg: {}".format(install_msg))
+                metadata = self.extract_roles_metadata(install_msg)
+                metadata_file = self.export_data(metadata, cache_dir_path, download_metadata_file)
+                md = self.find_target_metadata(LoadType.ROLE, metadata_file, self.target_name)
+            self.move_src(sub_dependency_dir_path, cache_dir_path)
+            if md is not None:
+                downloaded_dep.metadata = md
+        elif name in role_dependency_dirs:
+            logging.debug("use the specified dependency dirs")
+            sub_dependency_dir_path = role_dependency_dirs[name]
+        else:
+            is_exist, _ = self.is_download_file_exist(LoadType.ROLE, name, os.path.join(role_download_root, name))
+            if is_exist:
+                metadata_file = os.path.join(role_download_root, name, download_metadata_file)
+                md = self.find_target_metadata(LoadType.ROLE, metadata_file, name)
+                self.move_src(md.download_src_path, sub_dependency_dir_path)
+            else:
+                install_msg = install_galaxy_target(name, LoadType.ROLE, sub_dependency_dir_path, self.source_repository)
+                logging.debug("role install msg: {}".format(install_msg))
+                metadata = self.extract_roles_metadata(install_msg)
+                sub_download_location = os.path.join(role_download_root, name)
+                metadata_file = self.export_data(metadata, sub_download_location, download_metadata_file)
+                md = self.find_target_metadata(LoadType.ROLE, metadata_file, name)
+            if md is not None:
+                downloaded_dep.metadata = md
+        downloaded_dep.metadata.source_repository = self.source_repository
+        downloaded_dep.dir = sub_dependency_dir_path
+        return _dependency_to_dict(downloaded_dep)
 
     def src_install(self):
         try:
@@ -404,8 +623,7 @@ class DependencyDirPreparator(object):
             logging.debug("index: {}".format(json.dumps(self.index)))
         if self.do_save:
             self.__save_index()
-        if not os.path.exists(dst_src_dir):
-            os.makedirs(dst_src_dir)
+        os.makedirs(dst_src_dir, exist_ok=True)
         self.move_src(tmp_src_dir, dst_src_dir)
         root_dst_src_path = "{}/{}".format(dst_src_dir, self.target_name)
         if self.target_type == LoadType.ROLE:
@@ -416,10 +634,9 @@ class DependencyDirPreparator(object):
 
         if self.target_type == LoadType.PROJECT and self.target_dependency_dir:
             dst_dependency_dir = self.target_path_mappings["dependencies"]
-            if not os.path.exists(dst_dependency_dir):
-                os.makedirs(dst_dependency_dir)
+            os.makedirs(dst_dependency_dir, exist_ok=True)
             self.move_src(dependency_dir, dst_dependency_dir)
-            logging.debug("root metadata: {}".format(json.dumps(asdict(self.metadata))))
+            logging.debug("root metadata: {}".format(json.dumps(self.metadata.__dict__)))
         return
 
     def set_index(self, path):
@@ -430,15 +647,21 @@ class DependencyDirPreparator(object):
         if os.path.isfile(path):
             # need further check?
             dep_type = LoadType.PLAYBOOK
-            target_path_list.append = [path]
-        elif os.path.exists(os.path.join(path, collection_manifest_json)):
-            dep_type = LoadType.COLLECTION
-            target_path_list = [path]
-        elif os.path.exists(os.path.join(path, role_meta_main_yml)):
-            dep_type = LoadType.ROLE
             target_path_list = [path]
         else:
-            dep_type, target_path_list = find_ext_dependencies(path)
+            # one listdir instead of a stat per candidate metadata file
+            try:
+                names = set(os.listdir(path))
+            except OSError:
+                names = set()
+            if collection_manifest_json in names:
+                dep_type = LoadType.COLLECTION
+                target_path_list = [path]
+            elif "meta" in names and os.path.exists(os.path.join(path, role_meta_main_yml)):
+                dep_type = LoadType.ROLE
+                target_path_list = [path]
+            else:
+                dep_type, target_path_list = find_ext_dependencies(path)
 
         if not self.silent:
             logging.info('the detected target type: "{}", found targets: {}'.format(self.target_type, len(target_path_list)))
@@ -464,70 +687,175 @@ class DependencyDirPreparator(object):
 
         self.index = index_data
 
-    def download_galaxy_collection(self, target, output_dir, version="", source_repository=""):
-        server_option = ""
-        if source_repository:
-            server_option = "--server {}".format(source_repository)
-        target_version = target
-        if version:
-            target_version = "{}:{}".format(target, version)
+    def _run_galaxy(self, args, cwd=None):
+        # argv form skips the /bin/sh fork and avoids quoting issues
         proc = subprocess.run(
-            "ansible-galaxy collection download '{}' {} -p {}".format(target_version, server_option, output_dir),
-            shell=True,
+            ["ansible-galaxy"] + args,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
+            cwd=cwd,
         )
         install_msg = proc.stdout
         logging.debug("STDOUT: {}".format(install_msg))
         return install_msg
 
-    def download_galaxy_collection_from_reqfile(self, requirements, output_dir, source_repository=""):
-        server_option = ""
+    def _run_galaxy_inprocess(self, args):
+        # run GalaxyCLI inside this interpreter so the ansible import cost
+        # is paid once per run instead of once per forked subprocess
+        from ansible.cli.galaxy import GalaxyCLI
+
+        buffer = io.StringIO()
+        with _galaxy_cli_lock:
+            with contextlib.redirect_stdout(buffer):
+                try:
+                    GalaxyCLI(args=["ansible-galaxy"] + args).run()
+                except SystemExit as e:
+                    if e.code not in (None, 0):
+                        # GalaxyCLI reports failure by exiting; surface it as
+                        # a normal exception so callers' fallbacks catch it
+                        raise RuntimeError("ansible-galaxy exited with code {}".format(e.code)) from e
+        install_msg = buffer.getvalue()
+        logging.debug("STDOUT: {}".format(install_msg))
+        return install_msg
+
+    def _run_galaxy_install(self, args):
+        # installs do not need their output parsed, so they can use the
+        # in-process CLI; fall back to the subprocess form on any failure
+        try:
+            return self._run_galaxy_inprocess(args)
+        except Exception as e:
+            logging.debug("in-process ansible-galaxy run failed ({}); falling back to subprocess".format(e))
+            return self._run_galaxy(args)
+
+    def download_galaxy_collection(self, target, output_dir, version="", source_repository=""):
+        server_option = []
         if source_repository:
-            server_option = "--server {}".format(source_repository)
-        proc = subprocess.run(
-            "ansible-galaxy collection download -r {} {} -p {}".format(requirements, server_option, output_dir),
-            shell=True,
+            server_option = ["--server", source_repository]
+        target_version = target
+        if version:
+            target_version = "{}:{}".format(target, version)
+        cmd = ["ansible-galaxy", "collection", "download", target_version] + server_option + ["-p", output_dir]
+        # stream stdout line by line so progress is logged as the download
+        # runs instead of buffering the whole output until the process exits
+        proc = subprocess.Popen(
+            cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            # stderr was captured and discarded before; sending it to devnull
+            # avoids a deadlock if the unread pipe fills up mid-download
+            stderr=subprocess.DEVNULL,
             text=True,
+            bufsize=1,
         )
-        install_msg = proc.stdout
-        logging.debug("STDOUT: {}".format(install_msg))
-        # return proc.stdout
+        lines = []
+        for line in proc.stdout:
+            logging.debug("STDOUT: {}".format(line.rstrip("\n")))
+            lines.append(line)
+        proc.stdout.close()
+        proc.wait()
+        install_msg = "".join(lines)
+        return install_msg
+
+    def download_galaxy_collection_from_reqfile(self, requirements, output_dir, source_repository=""):
+        server_option = []
+        if source_repository:
+            server_option = ["--server", source_repository]
+        self._run_galaxy(["collection", "download", "-r", requirements] + server_option + ["-p", output_dir])
+
+    def _extract_collection_tarball(self, tarfile_path, output_dir):
+        # a galaxy tarball is named <namespace>-<name>-<version>.tar.gz and
+        # holds the collection content at its root, so we can place it under
+        # ansible_collections/<namespace>/<name> without running ansible-galaxy
+        basename = os.path.basename(tarfile_path)
+        if not basename.endswith(".tar.gz"):
+            raise ValueError("{} is not a .tar.gz file".format(tarfile_path))
+        parts = basename[: -len(".tar.gz")].split("-")
+        if len(parts) < 3:
+            raise ValueError("cannot get namespace/name from filename {}".format(basename))
+        dest_dir = os.path.join(output_dir, "ansible_collections", parts[0], parts[1])
+        os.makedirs(dest_dir, exist_ok=True)
+        # the data filter rejects absolute paths, traversal members and
+        # unsafe links; without it a crafted tarball could write outside
+        # dest_dir, so older interpreters fall back to ansible-galaxy,
+        # which does its own member validation
+        if not hasattr(tarfile, "data_filter"):
+            raise RuntimeError("tarfile.data_filter is not available on this interpreter")
+        # stream the archive through a large buffered reader; the default
+        # tarfile/gzip block sizes issue a read syscall every few KiB
+        with open(tarfile_path, "rb", buffering=_tar_buffer_size) as raw:
+            with gzip.GzipFile(fileobj=raw) as gz:
+                with tarfile.open(fileobj=gz, mode="r|") as tar:
+                    tar.extractall(path=dest_dir, filter="data")
 
     def install_galaxy_collection_from_targz(self, tarfile, output_dir):
         logging.debug("install collection from {}".format(tarfile))
-        proc = subprocess.run(
-            "ansible-galaxy collection install {} -p {}".format(tarfile, output_dir),
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        install_msg = proc.stdout
-        logging.debug("STDOUT: {}".format(install_msg))
-        # return proc.stdout
+        try:
+            self._extract_collection_tarball(tarfile, output_dir)
+            return
+        except Exception as e:
+            logging.debug("in-process extraction of {} failed ({}); falling back to ansible-galaxy".format(tarfile, e))
+        self._run_galaxy(["collection", "install", tarfile, "-p", output_dir])
+
+    def _queue_targz_install(self, tarfile_path, output_dir):
+        with self._pending_targz_lock:
+            self._pending_targz_installs.append((tarfile_path, output_dir))
+
+    def _flush_targz_installs(self):
+        # group queued tarballs by output dir so each dir needs only one
+        # `ansible-galaxy collection install` invocation
+        per_dir = {}
+        for tarfile_path, output_dir in self._pending_targz_installs:
+            per_dir.setdefault(output_dir, []).append(tarfile_path)
+        self._pending_targz_installs = []
+        for output_dir, tarfiles in per_dir.items():
+            self._install_collections_batch(tarfiles, output_dir)
+
+    def _install_collections_batch(self, tarfiles, output_dir):
+        # extract local tarballs in-process when possible; anything that
+        # cannot be handled that way goes to a single ansible-galaxy call
+        remaining = []
+        for tarfile_path in tarfiles:
+            try:
+                self._extract_collection_tarball(tarfile_path, output_dir)
+            except Exception as e:
+                logging.debug("in-process extraction of {} failed ({}); queueing for ansible-galaxy".format(tarfile_path, e))
+                remaining.append(tarfile_path)
+        tarfiles = remaining
+        if not tarfiles:
+            return
+        if len(tarfiles) == 1:
+            self.install_galaxy_collection_from_targz(tarfiles[0], output_dir)
+            return
+        logging.debug("install {} collections with a single requirements file".format(len(tarfiles)))
+        import yaml
+
+        requirements = {"collections": [{"name": tarfile_path} for tarfile_path in tarfiles]}
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", prefix="ari-reqs-") as reqfile:
+            yaml.safe_dump(requirements, reqfile)
+            reqfile.flush()
+            self._run_galaxy_install(["collection", "install", "-r", reqfile.name, "-p", output_dir])
 
     def install_galaxy_collection_from_reqfile(self, requirements, output_dir):
         logging.debug("install collection from {}".format(requirements))
         src_dir = requirements.replace(requirements_yml, "")
-        proc = subprocess.run(
-            "cd {} && ansible-galaxy collection install -r {} -p {}".format(src_dir, requirements, output_dir),
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        install_msg = proc.stdout
-        logging.debug("STDOUT: {}".format(install_msg))
-        # return proc.stdout
+        # src_dir is empty when requirements has no directory component;
+        # cwd="" would make subprocess.run raise FileNotFoundError
+        self._run_galaxy(["collection", "install", "-r", requirements, "-p", output_dir], cwd=src_dir or None)
 
     def is_download_file_exist(self, type, target, dir):
+        # the same query is issued more than once per dependency; key the
+        # result on the dir mtime so new downloads invalidate the cache
+        try:
+            dir_mtime = os.stat(dir).st_mtime_ns
+        except OSError:
+            dir_mtime = 0
+        cache_key = (type, target, dir, dir_mtime)
+        cached = self._exist_cache.get(cache_key)
+        if cached is not None:
+            return cached
         is_exist = False
         filename = ""
-        download_metadata_files = glob.glob(os.path.join(dir, type, "**", download_metadata_file), recursive=True)
+        download_metadata_files = self._find_download_metadata_files(os.path.join(dir, type))
         # check if tar.gz file already exists
         if len(download_metadata_files) != 0:
             for metafile in download_metadata_files:
@@ -541,28 +869,44 @@ class DependencyDirPreparator(object):
                 if file.endswith(".tar.gz") and namepart in file:
                     is_exist = True
                     filename = file
+        self._exist_cache[cache_key] = (is_exist, filename)
         return is_exist, filename
 
+    def _find_download_metadata_files(self, base_dir):
+        # download_meta.json normally sits one level below base_dir, so a
+        # shallow os.scandir avoids the stat storm of a recursive glob;
+        # fall back to a full walk only when the shallow scan finds nothing
+        results = []
+        if not os.path.isdir(base_dir):
+            return results
+        metafile = os.path.join(base_dir, download_metadata_file)
+        if os.path.isfile(metafile):
+            results.append(metafile)
+        with os.scandir(base_dir) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                metafile = os.path.join(entry.path, download_metadata_file)
+                if os.path.isfile(metafile):
+                    results.append(metafile)
+        if not results:
+            for dirpath, _, filenames in os.walk(base_dir):
+                if download_metadata_file in filenames:
+                    results.append(os.path.join(dirpath, download_metadata_file))
+        return results
+
     def install_galaxy_role_from_reqfile(self, file, output_dir):
-        proc = subprocess.run(
-            "ansible-galaxy role install -r {} -p {}".format(file, output_dir),
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        install_msg = proc.stdout
-        logging.debug("STDOUT: {}".format(install_msg))
+        self._run_galaxy_install(["role", "install", "-r", file, "-p", output_dir])
 
     def extract_collections_metadata(self, log_message, download_location):
         # -- log message
         # Downloading collection 'community.rabbitmq:1.2.3' to
         # Downloading https://galaxy.ansible.com/download/ansible-posix-1.4.0.tar.gz to ...
-        download_url_pattern = r"Downloading (.*) to"
         url = ""
         version = ""
         hash = ""
-        match_messages = re.findall(download_url_pattern, log_message)
+        match_messages = _DOWNLOAD_URL_RE.findall(log_message)
+        mtimes = _scandir_mtimes(download_location)
         metadata_list = []
         for m in match_messages:
             metadata = DownloadMetadata()
@@ -570,18 +914,19 @@ class DependencyDirPreparator(object):
             if m.endswith("tar.gz"):
                 logging.debug("extracted url from download log message: {}".format(m))
                 url = m
-                version = url.split("-")[-1].replace(".tar.gz", "")
-                name = "{}.{}".format(url.split("-")[0].split("/")[-1], url.split("-")[1])
+                dash_parts = url.split("-")
+                version = dash_parts[-1].replace(".tar.gz", "")
+                name = "{}.{}".format(dash_parts[0].rsplit("/", 1)[-1], dash_parts[1])
                 metadata.download_url = url
                 metadata.version = version
                 metadata.name = name
-                filename = url.split("/")[-1]
+                filename = url.rsplit("/", 1)[-1]
                 fullpath = "{}/{}".format(download_location, filename)
-                if not os.path.exists(fullpath):
+                m_time = mtimes.get(filename)
+                if m_time is None:
                     logging.warning("failed to get metadata for {}".format(url))
-                    pass
-                m_time = os.path.getmtime(fullpath)
-                dt_m = datetime.datetime.utcfromtimestamp(m_time).isoformat()
+                    m_time = os.path.getmtime(fullpath)
+                dt_m = _utc_isoformat(m_time)
                 metadata.download_timestamp = dt_m
                 metadata.download_src_path = fullpath
                 metadata.metafile_path, metadata.files_json_path = self.get_metafile_in_target(LoadType.COLLECTION, fullpath)
@@ -591,9 +936,12 @@ class DependencyDirPreparator(object):
                 if url != "":
                     hash = get_hash_of_url(url)
                     metadata.hash = hash
-                logging.debug("metadata: {}".format(json.dumps(asdict(metadata))))
+                # DownloadMetadata fields are all scalars, so a shallow dict
+                # is equivalent to asdict() without the recursive copy
+                metadata_dict = dict(metadata.__dict__)
+                logging.debug("metadata: {}".format(json.dumps(metadata_dict)))
 
-                metadata_list.append(asdict(metadata))
+                metadata_list.append(metadata_dict)
         result = {"collections": metadata_list}
         return result
 
@@ -604,34 +952,42 @@ class DependencyDirPreparator(object):
         version = ""
         hash = ""
         metadata_list = []
+        dir_mtimes = {}
         messages = log_message.splitlines()
         for i, line in enumerate(messages):
-            if line.startswith("- downloading role from "):
+            match = _ROLE_DOWNLOAD_RE.match(line)
+            if match:
                 metadata = DownloadMetadata()
                 metadata.type = LoadType.ROLE
-                url = line.split(" ")[-1]
+                url = match.group(1)
                 logging.debug("extracted url from download log message: {}".format(url))
-                version = url.split("/")[-1].replace(".tar.gz", "")
-                name = messages[i + 1].split("/")[-1]
+                version = url.rsplit("/", 1)[-1].replace(".tar.gz", "")
+                name = messages[i + 1].rsplit("/", 1)[-1]
                 metadata.download_url = url
                 metadata.version = version
                 metadata.name = name
                 role_dir = messages[i + 1].split(" ")[-1]
-                m_time = os.path.getmtime(role_dir)
-                dt_m = datetime.datetime.utcfromtimestamp(m_time).isoformat()
+                parent_dir = os.path.dirname(role_dir)
+                if parent_dir not in dir_mtimes:
+                    dir_mtimes[parent_dir] = _scandir_mtimes(parent_dir)
+                m_time = dir_mtimes[parent_dir].get(os.path.basename(role_dir))
+                if m_time is None:
+                    m_time = os.path.getmtime(role_dir)
+                dt_m = _utc_isoformat(m_time)
                 metadata.download_timestamp = dt_m
                 metadata.download_src_path = role_dir
                 if url != "":
                     hash = get_hash_of_url(url)
                     metadata.hash = hash
-                logging.debug("metadata: {}".format(json.dumps(asdict(metadata))))
-                metadata_list.append(asdict(metadata))
+                metadata_dict = dict(metadata.__dict__)
+                logging.debug("metadata: {}".format(json.dumps(metadata_dict)))
+                metadata_list.append(metadata_dict)
         result = {"roles": metadata_list}
         return result
 
     def find_target_metadata(self, type, metadata_file, target):
-        with open(metadata_file, "r") as f:
-            metadata = json.load(f)
+        st = os.stat(metadata_file)
+        metadata = _load_metadata_file(metadata_file, st.st_mtime_ns, st.st_size)
         if type == LoadType.COLLECTION:
             metadata_list = metadata.get("collections", [])
         elif type == LoadType.ROLE:
@@ -651,9 +1007,13 @@ class DependencyDirPreparator(object):
             base_dir = dependency_dir_path
             if os.path.exists(os.path.join(dependency_dir_path, "ansible_collections")):
                 base_dir = os.path.join(dependency_dir_path, "ansible_collections")
-            namespaces = [ns for ns in os.listdir(base_dir) if not ns.endswith(".info")]
+            # scandir entries carry their path and a cached stat, so the
+            # is_dir filter below costs no extra syscall on most filesystems
+            with os.scandir(base_dir) as it:
+                namespaces = [ns for ns in it if ns.is_dir(follow_symlinks=False) and not ns.name.endswith(".info")]
             for ns in namespaces:
-                colls = [{"name": f"{ns}.{name}", "path": os.path.join(base_dir, ns, name)} for name in os.listdir(os.path.join(base_dir, ns))]
+                with os.scandir(ns.path) as it:
+                    colls = [{"name": f"{ns.name}.{e.name}", "path": e.path} for e in it if e.is_dir(follow_symlinks=False)]
                 search_dirs.extend(colls)
 
         dependency_dirs = []
@@ -674,39 +1034,44 @@ class DependencyDirPreparator(object):
 
     def __save_index(self):
         index_location = self.__path_mappings["index"]
-        index_dir = os.path.dirname(os.path.abspath(index_location))
-        if not os.path.exists(index_dir):
-            os.makedirs(index_dir)
-        with open(index_location, "w") as f:
-            json.dump(self.index, f, indent=2)
+        if not self._index_dir:
+            # abspath resolves cwd with a syscall; the location never
+            # changes within an instance, so compute it once
+            self._index_dir = os.path.dirname(os.path.abspath(index_location))
+        self._ensure_dir(self._index_dir)
+        _json_dump_file(self.index, index_location, indent=True)
 
     def move_src(self, src, dst):
         if src == "" or not os.path.exists(src) or not os.path.isdir(src):
             raise ValueError("src {} is not directory".format(src))
         if dst == "" or ".." in dst:
             raise ValueError("dst {} is invalid".format(dst))
-        # we use cp command here because shutil module is slow,
-        # but the behavior of cp command is slightly different between Mac and Linux
-        # we use a command like `cp -r <src>/* <dst>/` so the behavior will be the same
-        os.system("cp -r {}/* {}/".format(src, dst))
+        # copy in-process instead of forking `cp -r`; this merges into an
+        # existing dst like `cp -r <src>/* <dst>/` did
+        _fast_copytree(src, dst)
         return
 
     def setup_tmp_dir(self):
         if self.tmp_install_dir is None or not os.path.exists(self.tmp_install_dir.name):
-            self.tmp_install_dir = tempfile.TemporaryDirectory()
+            # prefer tmpfs scratch space when it has enough room; install
+            # trees are short-lived, so RAM-backed writes skip the disk
+            self.tmp_install_dir = tempfile.TemporaryDirectory(dir=_tmpfs_scratch_root())
 
     def clean_tmp_dir(self):
         if self.tmp_install_dir is not None and os.path.exists(self.tmp_install_dir.name):
             self.tmp_install_dir.cleanup()
             self.tmp_install_dir = None
 
+    def _ensure_dir(self, dir):
+        if dir not in self._ensured_dirs:
+            os.makedirs(dir, exist_ok=True)
+            self._ensured_dirs.add(dir)
+
     def export_data(self, data, dir, filename):
-        if not os.path.exists(dir):
-            os.makedirs(dir)
+        self._ensure_dir(dir)
         file = os.path.join(dir, filename)
         logging.debug("export data {} to {}".format(data, file))
-        with open(file, "w") as f:
-            json.dump(data, f)
+        _json_dump_file(data, file)
         return file
 
     def get_metafile_in_target(self, type, filepath):
@@ -714,34 +1079,41 @@ class DependencyDirPreparator(object):
         files_path = ""
         if type == LoadType.COLLECTION:
             # get manifest.json
-            with tarfile.open(name=filepath, mode="r") as tar:
-                for info in tar.getmembers():
+            # stream mode avoids the full decompression pass that getmembers()
+            # needs to build the member list; stop once both files are written
+            targets = (collection_manifest_json, collection_files_json)
+            with tarfile.open(name=filepath, mode="r|gz", bufsize=_tar_buffer_size) as tar:
+                for info in tar:
+                    # single scan over both suffixes instead of one endswith each
+                    if not info.name.endswith(targets):
+                        continue
+                    f = tar.extractfile(info)
                     if info.name.endswith(collection_manifest_json):
-                        f = tar.extractfile(info)
-                        metafile_path = filepath.replace(".tar.gz", "-{}".format(collection_manifest_json))
-                        with open(metafile_path, "wb") as c:
-                            c.write(f.read())
-                    if info.name.endswith(collection_files_json):
-                        f = tar.extractfile(info)
-                        files_path = filepath.replace(".tar.gz", "-{}".format(collection_files_json))
-                        with open(files_path, "wb") as c:
-                            c.write(f.read())
+                        target = collection_manifest_json
+                    else:
+                        target = collection_files_json
+                    out_path = filepath.replace(".tar.gz", "-{}".format(target))
+                    with open(out_path, "wb", buffering=1 << 20) as c:
+                        shutil.copyfileobj(f, c, length=1 << 20)
+                    if target == collection_manifest_json:
+                        metafile_path = out_path
+                    else:
+                        files_path = out_path
+                    if metafile_path and files_path:
+                        break
         elif type == LoadType.ROLE:
             # get meta/main.yml path
-            role_meta_files = safe_glob(
-                [
-                    os.path.join(filepath, "**", role_meta_main_yml),
-                    os.path.join(filepath, "**", role_meta_main_yaml),
-                ],
-                recursive=True,
-            )
+            try:
+                dir_mtime = os.stat(filepath).st_mtime_ns
+            except OSError:
+                dir_mtime = 0
+            role_meta_files = _role_meta_glob(filepath, dir_mtime)
             if len(role_meta_files) != 0:
                 metafile_path = role_meta_files[0]
         return metafile_path, files_path
 
     def update_metadata(self, type, metadata_file, target, key, value):
-        with open(metadata_file, "r") as f:
-            metadata = json.load(f)
+        metadata = _json_load_file(metadata_file)
         if type == LoadType.COLLECTION:
             metadata_list = metadata.get("collections", [])
         elif type == LoadType.ROLE:
@@ -749,71 +1121,96 @@ class DependencyDirPreparator(object):
         else:
             logging.warning("metadata not found: {}".format(target))
             return None
-        for i, data in enumerate(metadata_list):
-            dm = DownloadMetadata(**data)
-            if dm.name == target:
-                if hasattr(dm, key):
-                    setattr(dm, key, value)
-                metadata_list[i] = asdict(dm)
-                logging.debug("update {} in metadata: {}".format(key, dm))
-                if type == LoadType.COLLECTION:
-                    metadata["collections"] = metadata_list
-                elif type == LoadType.ROLE:
-                    metadata["roles"] = metadata_list
-                with open(metadata_file, "w") as f:
-                    json.dump(metadata, f)
+        updated = False
+        # mutate the entry dict in place; the DownloadMetadata round-trip
+        # only copied every field to update one key
+        for data in metadata_list:
+            if data.get("name") == target:
+                if key in _DM_FIELDS:
+                    data[key] = value
+                logging.debug("update {} in metadata: {}".format(key, data))
+                updated = True
+                # names are unique within a metadata file
+                break
+        if updated:
+            _json_dump_file(metadata, metadata_file)
         return
 
     def update_role_download_src(self, metadata_file, dst_src_dir):
-        with open(metadata_file, "r") as f:
-            metadata = json.load(f)
+        metadata = _json_load_file(metadata_file)
         metadata_list = metadata.get("roles", [])
-        for i, data in enumerate(metadata_list):
-            dm = DownloadMetadata(**data)
-            value = "{}/{}".format(dst_src_dir, dm.name)
+        for data in metadata_list:
+            value = "{}/{}".format(dst_src_dir, data.get("name", ""))
             key = "download_src_path"
-            if hasattr(dm, key):
-                setattr(dm, key, value)
-            dm.metafile_path, _ = self.get_metafile_in_target(LoadType.ROLE, value)
-            dm.author = self.get_author(LoadType.ROLE, dm.metafile_path)
-            metadata_list[i] = asdict(dm)
-            logging.debug("update {} in metadata: {}".format(key, dm))
-        metadata["roles"] = metadata_list
-        with open(metadata_file, "w") as f:
-            json.dump(metadata, f)
+            data[key] = value
+            data["metafile_path"], _ = self.get_metafile_in_target(LoadType.ROLE, value)
+            data["author"] = self.get_author(LoadType.ROLE, data["metafile_path"])
+            logging.debug("update {} in metadata: {}".format(key, data))
+        _json_dump_file(metadata, metadata_file)
         return
 
     def get_author(self, type, metafile_path):
-        if not os.path.exists(metafile_path):
+        try:
+            st = os.stat(metafile_path)
+        except OSError:
             logging.warning("invalid file path: {}".format(metafile_path))
             return ""
         if type == LoadType.COLLECTION:
-            with open(metafile_path, "r") as f:
-                metadata = json.load(f)
+            metadata = _load_metafile(metafile_path, st.st_mtime_ns, "json")
             authors = metadata.get("collection_info", {}).get("authors", [])
             return ",".join(authors)
         elif type == LoadType.ROLE:
-            with open(metafile_path, "r") as f:
-                metadata = yaml.safe_load(f)
+            metadata = _load_metafile(metafile_path, st.st_mtime_ns, "yaml")
             author = metadata.get("galaxy_info", {}).get("author", "")
             return author
 
 
+def _walk_ext_dependencies(path):
+    # collect collection and role markers in a single tree walk instead of
+    # one recursive glob per marker type; fwalk descends via openat() on
+    # the directory fd, so the kernel does not re-resolve the full path
+    # at every level (ansible itself only runs on POSIX, where fwalk exists)
+    collection_path_list = []
+    role_path_list = []
+    for dirpath, dirnames, filenames, _dirfd in os.fwalk(path):
+        if collection_manifest_json in filenames:
+            collection_path_list.append(dirpath)
+            # no need to descend into a collection looking for more targets
+            dirnames[:] = []
+            continue
+        if os.path.basename(dirpath) == "meta" and ("main.yml" in filenames or "main.yaml" in filenames):
+            role_path_list.append(os.path.dirname(dirpath))
+    return collection_path_list, role_path_list
+
+
+def _scan_ext_dependencies(path):
+    top_dirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    top_dirs.append(entry.path)
+                elif entry.name == collection_manifest_json:
+                    # the target itself is a collection root; nothing below matters
+                    return [path], []
+    except OSError:
+        return [], []
+    if len(top_dirs) <= 1:
+        return _walk_ext_dependencies(path)
+    # shard the walk across top-level subdirs
+    collection_path_list = []
+    role_path_list = []
+    with ThreadPoolExecutor(max_workers=_max_scan_workers) as executor:
+        for colls, roles in executor.map(_walk_ext_dependencies, top_dirs):
+            collection_path_list.extend(colls)
+            role_path_list.extend(roles)
+    return collection_path_list, role_path_list
+
+
 def find_ext_dependencies(path):
-    collection_meta_files = safe_glob(os.path.join(path, "**", collection_manifest_json), recursive=True)
-    if len(collection_meta_files) > 0:
-        collection_path_list = [trim_suffix(f, ["/" + collection_manifest_json]) for f in collection_meta_files]
-        collection_path_list = remove_subdirectories(collection_path_list)
-        return LoadType.COLLECTION, collection_path_list
-    role_meta_files = safe_glob(
-        [
-            os.path.join(path, "**", role_meta_main_yml),
-            os.path.join(path, "**", role_meta_main_yaml),
-        ],
-        recursive=True,
-    )
-    if len(role_meta_files) > 0:
-        role_path_list = [trim_suffix(f, ["/" + role_meta_main_yml, "/" + role_meta_main_yaml]) for f in role_meta_files]
-        role_path_list = remove_subdirectories(role_path_list)
-        return LoadType.ROLE, role_path_list
+    collection_path_list, role_path_list = _scan_ext_dependencies(path)
+    if len(collection_path_list) > 0:
+        return LoadType.COLLECTION, remove_subdirectories(collection_path_list)
+    if len(role_path_list) > 0:
+        return LoadType.ROLE, remove_subdirectories(role_path_list)
     return LoadType.UNKNOWN, []
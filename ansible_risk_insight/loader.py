@@ -28,10 +28,9 @@ role_meta_main_yaml = "meta/main.yaml"
 
 # remove a dir which is a sub directory of another dir in the list
 def remove_subdirectories(dir_list):
-    sorted_dir_list = sorted(dir_list)
     new_dir_list = []
-    for i, dir in enumerate(sorted_dir_list):
-        if i >= 1 and dir.startswith(sorted_dir_list[i - 1]):
+    for dir in sorted(dir_list):
+        if new_dir_list and dir.startswith(new_dir_list[-1].rstrip("/") + "/"):
             continue
         new_dir_list.append(dir)
     return new_dir_list
@@ -21,22 +21,24 @@ import hashlib
 import yaml
 import logging
 import json
+from functools import lru_cache
 from tabulate import tabulate
 
 from .findings import Findings
 
 
 def install_galaxy_target(target, target_type, output_dir, source_repository="", target_version=""):
-    server_option = ""
+    server_option = []
     if source_repository:
-        server_option = "--server {}".format(source_repository)
+        server_option = ["--server", source_repository]
     target_name = target
     if target_version:
         target_name = f"{target}:{target_version}"
-    logging.debug("exec ansible-galaxy cmd: ansible-galaxy {} install {} {} -p {}".format(target_type, target_name, server_option, output_dir))
+    cmd = ["ansible-galaxy", target_type, "install", target_name] + server_option + ["-p", output_dir]
+    logging.debug("exec ansible-galaxy cmd: {}".format(" ".join(cmd)))
+    # argv form avoids the /bin/sh fork and shell quoting of target names
     proc = subprocess.run(
-        "ansible-galaxy {} install {} {} -p {}".format(target_type, target_name, server_option, output_dir),
-        shell=True,
+        cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
@@ -46,8 +48,7 @@ def install_galaxy_target(target, target_type, output_dir, source_repository="",
 
 def install_github_target(target, output_dir):
     proc = subprocess.run(
-        "git clone {} {}".format(target, output_dir),
-        shell=True,
+        ["git", "clone", target, output_dir],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
@@ -145,7 +146,10 @@ def escape_local_path(path: str):
     return replaced
 
 
+@lru_cache(maxsize=1024)
 def get_hash_of_url(url: str):
+    # the hash of a released artifact never changes, so the same URL is
+    # only fetched once per run even when many dependencies share it
     response = requests.get(url)
     hash = hashlib.sha256(response.content).hexdigest()
     return hash